@@ -2,6 +2,11 @@
 """
 Federal Register API Client with PDF Content Extraction
 Downloads AI-related documents and extracts full text from PDFs.
+
+PDF backends: pdfium (pypdfium2, default), pymupdf, pdfminer and pdfplumber
+(fallback).
+PyMuPDF is licensed under the AGPL (or a commercial Artifex license), so it
+is never selected implicitly; opt in with --backend pymupdf.
 """
 
 import os
@@ -9,108 +14,621 @@ import re
 import sys
 import time
 import json
+import math
+import gzip
+import hashlib
+import signal
+import asyncio
+import tempfile
+import threading
+from contextlib import contextmanager
+from io import StringIO, TextIOWrapper
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 
 try:
     import requests
     import pdfplumber
+    import aiohttp
 except ImportError as e:
     print(f"❌ Missing required library: {e}")
     print("Installing required dependencies...")
     import subprocess
-    subprocess.check_call([sys.executable, "-m", "pip", "install", "requests", "pdfplumber"])
+    subprocess.check_call([sys.executable, "-m", "pip", "install", "requests", "pdfplumber", "aiohttp"])
     import requests
     import pdfplumber
+    import aiohttp
+
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+# pdfminer.six is installed with pdfplumber
+from pdfminer.converter import TextConverter
+from pdfminer.layout import LAParams
+from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+from pdfminer.pdfpage import PDFPage
+from pdfminer.pdftypes import resolve1
+
+try:
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
+
+try:
+    import pymupdf
+except ImportError:
+    try:
+        import fitz as pymupdf  # PyMuPDF < 1.24.3
+    except ImportError:
+        pymupdf = None
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    pa = None
+    pc = None
+
+try:
+    import brotli  # noqa: F401 - lets urllib3 decode br-encoded responses
+except ImportError:
+    brotli = None
+
+
+# PDF text extraction backends; pdfplumber is always available as the fallback
+PDF_BACKENDS = ("pdfium", "pymupdf", "pdfminer", "pdfplumber")
+DEFAULT_BACKEND = "pdfium"
+
+# Keywords a title or abstract must contain to count as AI-related
+AI_KEYWORDS = [
+    'artificial intelligence', 'machine learning', 'neural network',
+    'deep learning', 'ai safety', 'ai governance', 'algorithmic',
+    'automated decision', 'ai system', 'ai model', 'ai technology'
+]
+AI_KEYWORD_PATTERN = "|".join(map(re.escape, AI_KEYWORDS))
+VECTORIZED_FILTER_MIN_ROWS = 500  # below this, per-document matching is cheaper than building Arrow arrays
+
+# Upper bound on pdfminer-based extraction time for a single page, so one pathological page cannot stall a document
+SECONDS_PER_PAGE = 30
+
+# Filename slugs keep ASCII letters, digits, '_' and '-', turn whitespace into '-' and drop
+# everything else, via one bytes.translate() lookup-table pass instead of regex substitutions
+_SLUG_TABLE = bytes(ord('-') if chr(c).isspace() else c for c in range(256))
+_SLUG_DELETE = bytes(c for c in range(128) if not (chr(c).isalnum() or chr(c).isspace() or chr(c) in '-_'))
+
+# Content-stream pre-scan used to skip graphics-only pages before full parsing
+TEXT_OPERATOR_RE = re.compile(rb"(?<![A-Za-z0-9])(?:Tj|TJ|'|\")(?![A-Za-z0-9])")
+XOBJECT_OPERATOR_RE = re.compile(rb"(?<![A-Za-z0-9])Do(?![A-Za-z0-9])")
+GRAPHICS_STREAM_THRESHOLD = 1_000_000  # bytes
+MIN_TEXT_OPERATOR_DENSITY = 1 / 100_000  # text operators per content-stream byte
+
+# Concurrency and pacing for the PDF download pipeline
+DEFAULT_CONCURRENCY = 8
+DEFAULT_REQUEST_RATE = 4.0  # requests/second until the server tells us otherwise
+DOWNLOAD_CHUNK_SIZE = 1 << 16  # PDFs are streamed to disk in 64 KiB chunks
+PAGES_PER_TASK = 50  # pages extracted per process-pool task
+
+# On-disk compression for the cache and JSONL corpus; zstandard when installed, gzip otherwise
+COMPRESSION_SUFFIX = ".zst" if zstandard is not None else ".gz"
+CORPUS_COMPRESSION_LEVEL = 10
+
+# Output formats: one .txt per document (what the Knowledge Base ingests) or a single JSONL corpus
+OUTPUT_FORMATS = ("txt", "jsonl")
+DEFAULT_OUTPUT_FORMAT = "txt"
+
+API_CONCURRENCY = 4  # result pages fetched at once when paginating a search
+
+# Connection pooling and retry policy shared by the sync and async HTTP clients
+HTTP_POOL_SIZE = 32
+RETRY_TOTAL = 5
+RETRY_BACKOFF_FACTOR = 1.0
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def _extract_pages_pdfium(pdf_path, start, stop):
+    """Extract page-delimited text for pages [start, stop) with PDFium (C++ backend)."""
+    pdf = pdfium.PdfDocument(pdf_path)
+    try:
+        buf = StringIO()
+        for index in range(start, min(stop, len(pdf))):
+            page = pdf[index]
+            textpage = page.get_textpage()
+            page_text = textpage.get_text_bounded().replace("\r\n", "\n").strip()
+            textpage.close()
+            page.close()
+            if page_text:
+                buf.write(f"--- Page {index + 1} ---\n")
+                buf.write(page_text)
+                buf.write("\n\n")
+
+        return buf.getvalue() or None
+    finally:
+        pdf.close()
+
+
+def _extract_pages_pymupdf(pdf_path, start, stop):
+    """Extract page-delimited text for pages [start, stop) with PyMuPDF (MuPDF C backend)."""
+    doc = pymupdf.open(pdf_path)
+    try:
+        buf = StringIO()
+        for index in range(start, min(stop, doc.page_count)):
+            page_text = doc.load_page(index).get_text("text").strip()
+            if page_text:
+                buf.write(f"--- Page {index + 1} ---\n")
+                buf.write(page_text)
+                buf.write("\n\n")
+
+        return buf.getvalue() or None
+    finally:
+        doc.close()
+
+
+def _is_graphics_only(page):
+    """Return True if a pdfminer page's content stream cannot yield useful text.
+
+    Scans the raw (decoded) content stream for text-showing operators instead
+    of interpreting every path/fill/color operator. Pages that invoke XObjects
+    are kept, since a form XObject may carry the page's text.
+    """
+    try:
+        stream = b"".join(resolve1(ref).get_data() for ref in page.contents)
+    except Exception:
+        return False
+
+    text_ops = len(TEXT_OPERATOR_RE.findall(stream))
+    if not text_ops:
+        return not XOBJECT_OPERATOR_RE.search(stream)
+
+    return len(stream) > GRAPHICS_STREAM_THRESHOLD and text_ops / len(stream) < MIN_TEXT_OPERATOR_DENSITY
+
+
+class _PageTimeout(Exception):
+    """Raised when extracting a single page exceeds SECONDS_PER_PAGE."""
+
+
+@contextmanager
+def _page_time_limit(seconds):
+    """Raise _PageTimeout if the block runs longer than ``seconds``.
+
+    Uses SIGALRM, so the limit only applies on POSIX in the main thread
+    (which is where ProcessPoolExecutor workers run tasks); elsewhere the
+    block runs unbounded.
+    """
+    if not hasattr(signal, "SIGALRM") or threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    def _on_alarm(signum, frame):
+        raise _PageTimeout()
+
+    previous = signal.signal(signal.SIGALRM, _on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _extract_pages_pdfplumber(pdf_path, start, stop):
+    """Return ``(text, timed_out)`` for pages [start, stop) extracted with pdfplumber (pure-Python pdfminer)."""
+    # laparams=None keeps pdfminer's layout analysis off; pdfplumber groups
+    # characters into lines itself, and passing {} would switch LAParams on
+    with pdfplumber.open(pdf_path, pages=list(range(start + 1, stop + 1)), laparams=None) as pdf:
+        buf = StringIO()
+        has_text = False
+        timed_out = False
+        for page in pdf.pages:
+            page_num = page.page_number
+            if _is_graphics_only(page.page_obj):
+                buf.write(f"--- Page {page_num} (no text) ---\n\n")
+                continue
+
+            try:
+                with _page_time_limit(SECONDS_PER_PAGE):
+                    page_text = page.extract_text()
+            except _PageTimeout:
+                print(f"   ⚠️  Page {page_num} exceeded {SECONDS_PER_PAGE}s, skipping")
+                buf.write(f"--- Page {page_num} (timed out) ---\n\n")
+                timed_out = True
+                continue
+
+            if page_text:
+                buf.write(f"--- Page {page_num} ---\n")
+                buf.write(page_text.strip())
+                buf.write("\n\n")
+                has_text = True
+
+        return (buf.getvalue() if has_text else None), timed_out
+
+
+def _extract_pages_pdfminer(pdf_path, start, stop):
+    """Return ``(text, timed_out)`` for pages [start, stop) extracted with pdfminer.six directly."""
+    rsrcmgr = PDFResourceManager(caching=True)
+    out = StringIO()
+    # Without layout analysis TextConverter emits no line breaks
+    device = TextConverter(rsrcmgr, out, laparams=LAParams())
+    interpreter = PDFPageInterpreter(rsrcmgr, device)
+    buf = StringIO()
+    has_text = False
+    timed_out = False
+
+    try:
+        with open(pdf_path, 'rb') as fp:
+            pages = PDFPage.get_pages(fp, pagenos=range(start, stop), maxpages=stop, caching=True)
+            for page_num, page in enumerate(pages, start + 1):
+                if _is_graphics_only(page):
+                    buf.write(f"--- Page {page_num} (no text) ---\n\n")
+                    continue
+
+                try:
+                    with _page_time_limit(SECONDS_PER_PAGE):
+                        interpreter.process_page(page)
+                except _PageTimeout:
+                    print(f"   ⚠️  Page {page_num} exceeded {SECONDS_PER_PAGE}s, skipping")
+                    buf.write(f"--- Page {page_num} (timed out) ---\n\n")
+                    timed_out = True
+                    continue
+                finally:
+                    page_text = out.getvalue().replace("\x0c", "").strip()
+                    out.seek(0)
+                    out.truncate(0)
+
+                if page_text:
+                    buf.write(f"--- Page {page_num} ---\n")
+                    buf.write(page_text)
+                    buf.write("\n\n")
+                    has_text = True
+    finally:
+        device.close()
+
+    return (buf.getvalue() if has_text else None), timed_out
+
+
+def _count_pages(pdf_path, backend=DEFAULT_BACKEND):
+    """Return the number of pages in a PDF file."""
+    try:
+        if backend == "pdfium" and pdfium is not None:
+            pdf = pdfium.PdfDocument(pdf_path)
+            try:
+                return len(pdf)
+            finally:
+                pdf.close()
+        if backend == "pymupdf" and pymupdf is not None:
+            with pymupdf.open(pdf_path) as doc:
+                return doc.page_count
+    except Exception:
+        pass
+
+    with pdfplumber.open(pdf_path) as pdf:
+        return len(pdf.pages)
+
+
+def _page_ranges(page_count):
+    """Split a document into contiguous [start, stop) page ranges of PAGES_PER_TASK."""
+    return [(start, min(start + PAGES_PER_TASK, page_count)) for start in range(0, page_count, PAGES_PER_TASK)]
+
+
+def _extract_page_range(pdf_path, backend, start, stop):
+    """Extract pages [start, stop) with ``backend``; returns ``(text, incomplete)``, text None if nothing was extracted."""
+    if backend == "pdfminer":
+        return _extract_pages_pdfminer(pdf_path, start, stop)
+
+    extract = None
+    if backend == "pdfium" and pdfium is not None:
+        extract = _extract_pages_pdfium
+    elif backend == "pymupdf" and pymupdf is not None:
+        extract = _extract_pages_pymupdf
+
+    failed = False
+    if extract is not None:
+        try:
+            text = extract(pdf_path, start, stop)
+            if text:
+                return text, False
+        except Exception as e:
+            print(f"   ⚠️  {backend} extraction failed, falling back to pdfplumber: {e}")
+            failed = True
+
+    text, timed_out = _extract_pages_pdfplumber(pdf_path, start, stop)
+    return text, failed or timed_out
+
+
+def _join_page_ranges(results):
+    """Reassemble per-range ``(text, incomplete)`` results in page order into one such tuple."""
+    text = "".join(text for text, _ in results if text) or None
+    return text, any(incomplete for _, incomplete in results)
+
+
+def _slugify(title, max_length=50):
+    """Turn a title into a filename-safe slug with runs of '-' collapsed."""
+    slug = title.encode('ascii', 'ignore').translate(_SLUG_TABLE, _SLUG_DELETE)
+    return b"-".join(filter(None, slug.split(b"-")))[:max_length].decode('ascii')
+
+
+def _compress(data):
+    """Compress bytes for the on-disk cache."""
+    if zstandard is not None:
+        return zstandard.ZstdCompressor().compress(data)
+    return gzip.compress(data)
+
+
+def _decompress(data):
+    """Decompress bytes written by ``_compress``."""
+    if zstandard is not None:
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+def _json_loads(data):
+    """Parse JSON from bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj, newline=False):
+    """Serialize to UTF-8 JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE if newline else 0)
+    data = json.dumps(obj, ensure_ascii=False).encode('utf-8')
+    return data + b"\n" if newline else data
+
+
+def _open_compressed_append(path):
+    """Open a compressed file for appending; each open starts a new frame/member."""
+    if zstandard is not None:
+        return zstandard.ZstdCompressor(level=CORPUS_COMPRESSION_LEVEL).stream_writer(open(path, "ab"))
+    return gzip.open(path, "ab", compresslevel=6)
+
+
+def _read_corpus_ids(path):
+    """Return the ids of all records in a compressed JSONL corpus, tolerating a truncated tail."""
+    ids = set()
+    if not path.exists():
+        return ids
+
+    try:
+        with open(path, "rb") as raw:
+            if zstandard is not None:
+                reader = zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True)
+            else:
+                reader = gzip.GzipFile(fileobj=raw)
+            for line in TextIOWrapper(reader, encoding='utf-8'):
+                if line.strip():
+                    ids.add(_json_loads(line)['id'])
+    except Exception as e:
+        print(f"   ⚠️  Could not fully read {path.name}: {e}")
+
+    return ids
+
+
+class _RateLimiter:
+    """Token bucket that adapts its pace to the server's X-RateLimit-* headers."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Wait until a request token is available."""
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def update(self, headers):
+        """Spread the remaining request budget evenly over the reset window."""
+        try:
+            remaining = int(headers['X-RateLimit-Remaining'])
+        except (KeyError, ValueError):
+            return
+
+        self.tokens = min(self.tokens, remaining)
+
+        try:
+            reset = float(headers['X-RateLimit-Reset'])
+        except (KeyError, ValueError):
+            return
+
+        # Reset may be an epoch timestamp or a number of seconds
+        if reset > 1e9:
+            reset -= time.time()
+        if reset > 0:
+            self.rate = max(remaining, 1) / reset
 
 
 class FederalRegisterAPI:
     """Federal Register API client with PDF content extraction."""
     
-    def __init__(self, output_dir="corpus/federal-register/ai-documents", max_docs=20):
+    def __init__(self, output_dir="corpus/federal-register/ai-documents", max_docs=20,
+                 concurrency=DEFAULT_CONCURRENCY, backend=DEFAULT_BACKEND, refresh=False,
+                 output_format=DEFAULT_OUTPUT_FORMAT):
+        if backend not in PDF_BACKENDS:
+            raise ValueError(f"Unknown PDF backend '{backend}', expected one of {PDF_BACKENDS}")
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format '{output_format}', expected one of {OUTPUT_FORMATS}")
+        
         self.api_base = "https://www.federalregister.gov/api/v1"
         self.web_base = "https://www.federalregister.gov"
         self.output_dir = Path(output_dir)
         self.max_docs = max_docs
+        self.concurrency = concurrency
+        self.backend = backend
+        self.refresh = refresh
+        self.output_format = output_format
+        self.corpus_path = self.output_dir / f"corpus.jsonl{COMPRESSION_SUFFIX}"
+        self._corpus_writer = None
+        self._corpus_ids = None  # ids already in the JSONL corpus, loaded on first use
+        self._run_timestamp = None  # set once per run() / run_comprehensive_search()
+        self.cache_dir = self.output_dir / ".cache"
+        self.api_cache_dir = self.cache_dir / "api"
         
-        # Create output directory
+        # Single-pass matcher for the AI relevance filter
+        self._ai_re = re.compile(AI_KEYWORD_PATTERN)
+        self._ai_ac = None
+        if ahocorasick is not None:
+            self._ai_ac = ahocorasick.Automaton()
+            for keyword in AI_KEYWORDS:
+                self._ai_ac.add_word(keyword, keyword)
+            self._ai_ac.make_automaton()
+        
+        # Create output and cache directories
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.api_cache_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Larger connection pool plus exponential-backoff retries on transient errors
+        retry = Retry(
+            total=RETRY_TOTAL,
+            backoff_factor=RETRY_BACKOFF_FACTOR,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=["GET"],
+        )
+        self._adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE, max_retries=retry)
         
-        # Session for connection reuse
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'FedRag-Research/1.0 (Educational Purpose)'
+        # Session for connection reuse; worker threads get their own (see _thread_session)
+        self.session = self._new_session()
+        self._thread_local = threading.local()
+    
+    def _new_session(self):
+        """Create a session with the client's headers and the shared pooled adapter."""
+        session = requests.Session()
+        session.headers.update({
+            'User-Agent': 'FedRag-Research/1.0 (Educational Purpose)',
+            'Accept-Encoding': 'br, gzip' if brotli is not None else 'gzip',
         })
+        session.mount("https://", self._adapter)
+        return session
     
-    def api_request(self, endpoint, params=None):
+    def _thread_session(self):
+        """Return this thread's session.
+
+        requests.Session is not guaranteed to be thread-safe, so each worker
+        thread gets its own; they share the adapter's (thread-safe) urllib3 pool.
+        """
+        session = getattr(self._thread_local, 'session', None)
+        if session is None:
+            session = self._thread_local.session = self._new_session()
+        return session
+    
+    def api_request(self, endpoint, params=None, session=None):
         """Make API request with proper headers."""
+        session = session or self.session
         url = f"{self.api_base}/{endpoint}"
+        cache_key = hashlib.blake2b(
+            json.dumps([endpoint, params], sort_keys=True).encode('utf-8'), digest_size=16
+        ).hexdigest()
+        cache_path = self.api_cache_dir / f"{cache_key}.json{COMPRESSION_SUFFIX}"
         
         try:
-            response = self.session.get(url, params=params, timeout=30)
+            cached = _json_loads(_decompress(cache_path.read_bytes()))
+        except Exception:
+            cached = None
+        
+        headers = {'Accept': 'application/json'}
+        if cached:
+            headers['If-None-Match'] = cached['etag']
+        
+        try:
+            response = session.get(url, params=params, headers=headers, timeout=30)
+            if response.status_code == 304 and cached:
+                return cached['body']
+            
             response.raise_for_status()
-            return response.json()
+            data = _json_loads(response.content)
+            
+            etag = response.headers.get('ETag')
+            if etag:
+                cache_path.write_bytes(_compress(_json_dumps({'etag': etag, 'body': data})))
+            
+            return data
         except Exception as e:
             print(f"❌ API request failed: {e}")
             return None
     
-    def download_pdf(self, pdf_url, max_retries=3):
-        """Download PDF and extract text content."""
-        if not pdf_url:
-            return None
-            
-        for attempt in range(max_retries):
-            try:
-                print(f"   📄 Downloading PDF (attempt {attempt + 1}/{max_retries})...")
-                response = self.session.get(pdf_url, timeout=60)
-                response.raise_for_status()
-                
-                # Save PDF content to a temporary file-like object
-                from io import BytesIO
-                pdf_bytes = BytesIO(response.content)
-                
-                # Extract text from PDF
-                with pdfplumber.open(pdf_bytes) as pdf:
-                    text_content = []
-                    for page_num, page in enumerate(pdf.pages, 1):
-                        page_text = page.extract_text()
-                        if page_text:
-                            text_content.append(f"--- Page {page_num} ---")
-                            text_content.append(page_text.strip())
-                            text_content.append("")
-                    
-                    if text_content:
-                        full_text = "\n".join(text_content)
-                        print(f"   ✅ Extracted {len(full_text)} characters from {len(pdf.pages)} pages")
-                        return full_text
-                    else:
-                        print("   ⚠️  No text extracted from PDF")
-                        return None
-                        
-            except Exception as e:
-                print(f"   ❌ PDF download attempt {attempt + 1} failed: {e}")
-                if attempt < max_retries - 1:
-                    time.sleep(2)
-                    
-        return None
+    def _is_ai_related(self, content):
+        """Check lowercased text for any AI keyword in a single scan."""
+        if self._ai_ac is not None:
+            return next(self._ai_ac.iter(content), None) is not None
+        return self._ai_re.search(content) is not None
     
-    def search_documents(self, term="artificial intelligence"):
-        """Search for documents using the official API."""
+    def _ai_relevance_mask(self, documents):
+        """Return one AI-relevance flag per document, based on title and abstract.
+
+        Large result sets are matched column-wise with pyarrow's vectorized
+        regex kernel when it is installed; smaller ones use the keyword matcher.
+        """
+        if pa is not None and len(documents) >= VECTORIZED_FILTER_MIN_ROWS:
+            titles = pa.array([doc.get('title') or '' for doc in documents], pa.string())
+            abstracts = pa.array([doc.get('abstract') or '' for doc in documents], pa.string())
+            mask = pc.or_(
+                pc.match_substring_regex(titles, AI_KEYWORD_PATTERN, ignore_case=True),
+                pc.match_substring_regex(abstracts, AI_KEYWORD_PATTERN, ignore_case=True),
+            )
+            return mask.to_pylist()
+        
+        return [
+            self._is_ai_related(f"{(doc.get('title') or '').lower()} {(doc.get('abstract') or '').lower()}")
+            for doc in documents
+        ]
+    
+    def _fetch_pages(self, endpoint, params, pages):
+        """Fetch several result pages concurrently, returned in page order."""
+        def fetch(page):
+            return self.api_request(endpoint, {**params, 'page': page}, session=self._thread_session())
+        
+        with ThreadPoolExecutor(max_workers=API_CONCURRENCY) as executor:
+            return list(executor.map(fetch, pages))
+    
+    def search_documents(self, term="artificial intelligence", limit=None):
+        """Search for documents using the official API.
+
+        Follows the API's pagination until ``limit`` results (default
+        ``max_docs``) have been collected or no further pages remain.
+        Pages after the first are requested concurrently.
+        """
         print(f"🔍 Searching Federal Register API for: '{term}'")
+        limit = limit or self.max_docs
         
         # API parameters for AI-related documents
         params = {
             'conditions[term]': term,
             'conditions[type][]': ['RULE', 'PRORULE', 'NOTICE'],
-            'per_page': min(self.max_docs, 100),  # API limit is 100
+            'per_page': min(limit, 100),  # API limit is 100
             'order': 'newest',
             'fields[]': [
                 'title', 'abstract', 'html_url', 'pdf_url', 
-                'publication_date', 'agencies', 'document_number',
-                'type', 'significant'
+                'publication_date', 'agency_names', 'document_number',
+                'type'
             ]
         }
         
+        # The first page tells us how many pages exist; any further pages
+        # needed to reach the limit are fetched concurrently
+        params['page'] = 1
         data = self.api_request('documents.json', params)
         
         if not data:
@@ -118,27 +636,24 @@ class FederalRegisterAPI:
             return []
         
         results = data.get('results', [])
+        
+        if data.get('next_page_url'):
+            pages_needed = math.ceil(limit / params['per_page'])
+            last_page = min(data.get('total_pages') or pages_needed, pages_needed)
+            for page_data in self._fetch_pages('documents.json', params, range(2, last_page + 1)):
+                if page_data:
+                    results.extend(page_data.get('results', []))
+        
+        results = results[:limit]
         print(f"✅ Found {len(results)} documents via API")
         
         # Filter for documents that have PDF URLs and are truly AI-related
         pdf_results = []
-        ai_keywords = [
-            'artificial intelligence', 'machine learning', 'neural network',
-            'deep learning', 'ai safety', 'ai governance', 'algorithmic',
-            'automated decision', 'ai system', 'ai model', 'ai technology'
-        ]
+        candidates = [doc for doc in results if doc.get('pdf_url')]
         
-        for doc in results:
-            if not doc.get('pdf_url'):
-                continue
-                
-            # Check if document is truly AI-related
-            title = (doc.get('title') or '').lower()
-            abstract = (doc.get('abstract') or '').lower()
-            content = f"{title} {abstract}"
-            
-            # Must contain AI keywords in title or abstract
-            if any(keyword in content for keyword in ai_keywords):
+        # Must contain AI keywords in title or abstract
+        for doc, is_ai_related in zip(candidates, self._ai_relevance_mask(candidates)):
+            if is_ai_related:
                 pdf_results.append(doc)
                 print(f"   ✅ AI-relevant: {doc.get('title', 'Untitled')[:60]}...")
             else:
@@ -146,64 +661,286 @@ class FederalRegisterAPI:
         
         print(f"📄 {len(pdf_results)} truly AI-related documents found")
         
-        return pdf_results[:self.max_docs]
+        return pdf_results[:limit]
     
     def save_document(self, document, pdf_content=None):
         """Save document with full content."""
+        if self.output_format == "jsonl":
+            return self._append_corpus_record(document, pdf_content)
+        
         title = document.get('title', 'Untitled Document')
         date = document.get('publication_date', 'unknown')
-        agencies = document.get('agencies', [])
-        agency_names = ', '.join([agency.get('name', 'Unknown') for agency in agencies])
+        agency_names = ', '.join(document.get('agency_names') or [])
         html_url = document.get('html_url', '')
         pdf_url = document.get('pdf_url', '')
         doc_number = document.get('document_number', '')
         doc_type = document.get('type', 'Unknown')
         
         # Create safe filename
-        safe_title = re.sub(r'[^\w\s-]', '', title)
-        safe_title = re.sub(r'[-\s]+', '-', safe_title)
-        safe_title = safe_title[:50]
+        safe_title = _slugify(title)
         
         filename = f"{date}-{safe_title}.txt"
         filepath = self.output_dir / filename
         
         # Prepare document content
-        document_text = f"""Title: {title}
+        buf = StringIO()
+        buf.write(f"""Title: {title}
 Date: {date}
 Document Number: {doc_number}
 Type: {doc_type}
 Agencies: {agency_names}
 HTML URL: {self.web_base}{html_url}
 PDF URL: {pdf_url}
-Downloaded: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+Downloaded: {self._run_timestamp or datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 {'=' * 80}
 
-"""
+""")
         
         # Add abstract
         if document.get('abstract'):
-            document_text += f"ABSTRACT:\n{document['abstract']}\n\n"
-            document_text += "=" * 80 + "\n\n"
+            buf.write(f"ABSTRACT:\n{document['abstract']}\n\n")
+            buf.write("=" * 80 + "\n\n")
         
         # Add full PDF content
         if pdf_content:
-            document_text += "FULL DOCUMENT CONTENT:\n\n"
-            document_text += pdf_content
+            buf.write("FULL DOCUMENT CONTENT:\n\n")
+            buf.write(pdf_content)
         else:
-            document_text += "Note: Full content available via PDF URL above.\n"
+            buf.write("Note: Full content available via PDF URL above.\n")
         
         # Save to file
         try:
             with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(document_text)
+                f.write(buf.getvalue())
             print(f"   💾 Saved: {filename}")
             return True
         except Exception as e:
             print(f"   ❌ Error saving: {e}")
             return False
     
+    def _append_corpus_record(self, document, pdf_content=None):
+        """Append a document as one JSON line to the compressed corpus, skipping ids already present."""
+        doc_number = document.get('document_number', '')
+        if self._corpus_ids is None:
+            self._corpus_ids = _read_corpus_ids(self.corpus_path)
+        if doc_number and doc_number in self._corpus_ids:
+            print(f"   💾 Already in {self.corpus_path.name}: {doc_number}")
+            return True
+        
+        record = {
+            'id': doc_number,
+            'title': document.get('title', 'Untitled Document'),
+            'date': document.get('publication_date', 'unknown'),
+            'type': document.get('type', 'Unknown'),
+            'agencies': document.get('agency_names') or [],
+            'html_url': f"{self.web_base}{document.get('html_url', '')}",
+            'pdf_url': document.get('pdf_url', ''),
+            'downloaded': self._run_timestamp or datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'abstract': document.get('abstract'),
+            'text': pdf_content,
+        }
+        line = _json_dumps(record, newline=True)
+        
+        try:
+            if self._corpus_writer is not None:
+                self._corpus_writer.write(line)
+            else:
+                with _open_compressed_append(self.corpus_path) as writer:
+                    writer.write(line)
+            self._corpus_ids.add(doc_number)
+            print(f"   💾 Appended {doc_number} to {self.corpus_path.name}")
+            return True
+        except Exception as e:
+            print(f"   ❌ Error saving: {e}")
+            return False
+    
+    def _read_cached_text(self, doc_number):
+        """Return cached extracted text and its HTTP validators, or (None, {})."""
+        text_path = self.cache_dir / f"{doc_number}.txt{COMPRESSION_SUFFIX}"
+        meta_path = self.cache_dir / f"{doc_number}.json"
+        
+        try:
+            metadata = json.loads(meta_path.read_text(encoding='utf-8'))
+        except Exception:
+            metadata = {}
+        
+        # Text extracted by a different backend is a cache miss
+        if metadata.get('backend') != self.backend:
+            return None, {}
+        
+        try:
+            text = _decompress(text_path.read_bytes()).decode('utf-8')
+        except Exception:
+            return None, {}
+        
+        return text, metadata
+    
+    def _write_cached_text(self, doc_number, text, validators):
+        """Cache extracted text along with the PDF's ETag/Last-Modified and the backend used."""
+        metadata = {**validators, 'backend': self.backend}
+        try:
+            (self.cache_dir / f"{doc_number}.txt{COMPRESSION_SUFFIX}").write_bytes(_compress(text.encode('utf-8')))
+            (self.cache_dir / f"{doc_number}.json").write_text(json.dumps(metadata), encoding='utf-8')
+        except Exception as e:
+            print(f"   ⚠️  Could not cache {doc_number}: {e}")
+    
+    async def _fetch(self, session, url, limiter, headers=None):
+        """Stream a URL to a temporary file; returns ``(status, path, validators)``, all None on failure."""
+        for attempt in range(RETRY_TOTAL + 1):
+            await limiter.acquire()
+            tmp = tempfile.NamedTemporaryFile(suffix=".pdf", delete=False)
+            try:
+                with tmp:
+                    async with session.get(url, headers=headers) as response:
+                        limiter.update(response.headers)
+                        response.raise_for_status()
+                        validators = {
+                            key: response.headers[header]
+                            for key, header in (('etag', 'ETag'), ('last_modified', 'Last-Modified'))
+                            if header in response.headers
+                        }
+                        if response.status == 304:
+                            os.unlink(tmp.name)
+                            return 304, None, validators
+                        
+                        async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                            tmp.write(chunk)
+                return response.status, tmp.name, validators
+            except Exception as e:
+                os.unlink(tmp.name)
+                retryable = not (isinstance(e, aiohttp.ClientResponseError) and e.status not in RETRY_STATUSES)
+                if not retryable or attempt == RETRY_TOTAL:
+                    print(f"   ❌ PDF download failed: {e}")
+                    return None, None, None
+                
+                delay = RETRY_BACKOFF_FACTOR * (2 ** attempt)
+                print(f"   ⚠️  PDF download attempt {attempt + 1} failed, retrying in {delay:.0f}s: {e}")
+                await asyncio.sleep(delay)
+        
+        return None, None, None
+    
+    async def _extract_in_pool(self, pool, pdf_path):
+        """Extract a PDF by fanning its page ranges out across the process pool.
+
+        Returns a ``(text, page_count, incomplete)`` tuple; ``text`` is None if nothing was extracted.
+        """
+        loop = asyncio.get_running_loop()
+        page_count = await loop.run_in_executor(pool, _count_pages, pdf_path, self.backend)
+        results = await asyncio.gather(*(
+            loop.run_in_executor(pool, _extract_page_range, pdf_path, self.backend, start, stop)
+            for start, stop in _page_ranges(page_count)
+        ))
+        text, incomplete = _join_page_ranges(results)
+        return text, page_count, incomplete
+    
+    async def _download_and_extract(self, session, limiter, pool, sem, queue, doc, label):
+        """Download one document's PDF (or reuse its cached text), extract it off-loop and queue it for saving."""
+        title = doc.get('title', 'Untitled')[:60]
+        pdf_url = doc.get('pdf_url')
+        doc_number = doc.get('document_number')
+        pdf_content = None
+        
+        cached_text, validators = self._read_cached_text(doc_number) if doc_number else (None, {})
+        
+        if cached_text is not None and not self.refresh:
+            print(f"{label} 💾 Using cached text: {title}...")
+            pdf_content = cached_text
+        elif pdf_url:
+            headers = {}
+            if cached_text is not None:
+                if 'etag' in validators:
+                    headers['If-None-Match'] = validators['etag']
+                if 'last_modified' in validators:
+                    headers['If-Modified-Since'] = validators['last_modified']
+            
+            async with sem:
+                print(f"{label} 📄 Downloading PDF: {title}...")
+                status, pdf_path, new_validators = await self._fetch(session, pdf_url, limiter, headers)
+            
+            if status == 304:
+                print(f"{label} 💾 PDF not modified, using cached text")
+                pdf_content = cached_text
+            elif pdf_path:
+                try:
+                    pdf_content, page_count, incomplete = await self._extract_in_pool(pool, pdf_path)
+                except Exception as e:
+                    print(f"{label} ❌ PDF extraction failed: {e}")
+                finally:
+                    os.unlink(pdf_path)
+                
+                if pdf_content:
+                    print(f"{label} ✅ Extracted {len(pdf_content)} characters from {page_count} pages")
+                    # Timed-out pages or a failed backend range are retried on the next run
+                    if incomplete:
+                        print(f"{label} ⚠️  Extraction incomplete, not caching")
+                    elif doc_number:
+                        self._write_cached_text(doc_number, pdf_content, new_validators)
+            
+            if not pdf_content and cached_text is not None:
+                # Refresh failed to download or extract; keep the previously cached text
+                print(f"{label} 💾 Refresh failed, using cached text")
+                pdf_content = cached_text
+            elif not pdf_content:
+                print(f"{label} ⚠️  PDF extraction failed, using abstract only")
+        else:
+            print(f"{label} ⚠️  No PDF URL available: {title}...")
+        
+        await queue.put((doc, pdf_content))
+    
+    async def _write_documents(self, queue):
+        """Single writer draining the save queue; returns the number of saved documents."""
+        success_count = 0
+        
+        if self.output_format == "jsonl":
+            self._corpus_ids = _read_corpus_ids(self.corpus_path)
+            self._corpus_writer = _open_compressed_append(self.corpus_path)
+        
+        try:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    break
+                
+                doc, pdf_content = item
+                if self.save_document(doc, pdf_content):
+                    success_count += 1
+        finally:
+            if self._corpus_writer is not None:
+                self._corpus_writer.close()
+                self._corpus_writer = None
+        
+        return success_count
+    
+    async def process_documents(self, documents):
+        """Download, extract and save documents concurrently."""
+        sem = asyncio.Semaphore(self.concurrency)
+        limiter = _RateLimiter(DEFAULT_REQUEST_RATE, self.concurrency)
+        queue = asyncio.Queue()
+        connector = aiohttp.TCPConnector(limit_per_host=self.concurrency, keepalive_timeout=60)
+        headers = {'User-Agent': self.session.headers['User-Agent']}
+        # Only stalls count as failures; large rule PDFs may take minutes to stream
+        timeout = aiohttp.ClientTimeout(total=None, sock_connect=30, sock_read=60)
+        total = len(documents)
+        
+        with ProcessPoolExecutor() as pool:
+            async with aiohttp.ClientSession(connector=connector, headers=headers, timeout=timeout) as session:
+                writer = asyncio.create_task(self._write_documents(queue))
+                tasks = [
+                    asyncio.create_task(
+                        self._download_and_extract(session, limiter, pool, sem, queue, doc, f"[{i}/{total}]")
+                    )
+                    for i, doc in enumerate(documents, 1)
+                ]
+                try:
+                    await asyncio.gather(*tasks)
+                finally:
+                    await queue.put(None)
+                
+                return await writer
+    
     def run_comprehensive_search(self):
         """Search for AI documents using multiple terms."""
+        self._run_timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         print("🚀 Federal Register Comprehensive AI Search")
         print("=" * 50)
         print(f"📁 Output directory: {self.output_dir}")
@@ -222,22 +959,12 @@ Downloaded: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
             "deep learning"
         ]
         
-        all_documents = {}  # Use dict to avoid duplicates
-        
-        for term in search_terms:
-            print(f"🔍 Searching for: '{term}'")
-            documents = self.search_documents(term)
-            
-            for doc in documents:
-                doc_id = doc.get('document_number')
-                if doc_id and doc_id not in all_documents:
-                    all_documents[doc_id] = doc
-            
-            print(f"   Found {len(documents)} new documents")
-            time.sleep(1)  # Rate limiting between searches
-            print()
+        # One OR-combined query instead of a request per term; the API's
+        # full-text search treats quoted phrases joined by | as alternatives
+        term = " | ".join(f'"{t}"' for t in search_terms)
+        unique_documents = self.search_documents(term, limit=self.max_docs * len(search_terms))
+        print()
         
-        unique_documents = list(all_documents.values())
         print(f"📊 Total unique AI documents found: {len(unique_documents)}")
         
         if not unique_documents:
@@ -247,33 +974,8 @@ Downloaded: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
         print(f"📋 Processing {len(unique_documents)} documents with PDF extraction...")
         print()
         
-        success_count = 0
-        
-        for i, doc in enumerate(unique_documents, 1):
-            title = doc.get('title', 'Untitled')[:60]
-            print(f"[{i}/{len(unique_documents)}] {title}...")
-            
-            # Download and extract PDF content
-            pdf_url = doc.get('pdf_url')
-            pdf_content = None
-            
-            if pdf_url:
-                pdf_content = self.download_pdf(pdf_url)
-                if pdf_content:
-                    print(f"   ✅ Extracted {len(pdf_content)} characters from PDF")
-                else:
-                    print("   ⚠️  PDF extraction failed, using abstract only")
-            else:
-                print("   ⚠️  No PDF URL available")
-            
-            if self.save_document(doc, pdf_content):
-                success_count += 1
-            
-            # Rate limiting - be respectful
-            if i < len(unique_documents):
-                time.sleep(2)
-            
-            print()
+        success_count = asyncio.run(self.process_documents(unique_documents))
+        print()
         
         print("✅ Comprehensive AI search completed!")
         print(f"📊 Successfully saved: {success_count}/{len(unique_documents)} documents")
@@ -283,6 +985,7 @@ Downloaded: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 
     def run(self, search_term="artificial intelligence"):
         """Main process with PDF content extraction."""
+        self._run_timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         print("🚀 Federal Register API Client with PDF Extraction")
         print("=" * 55)
         print(f"📁 Output directory: {self.output_dir}")
@@ -300,33 +1003,8 @@ Downloaded: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
         print(f"📋 Processing {len(documents)} documents with PDF extraction...")
         print()
         
-        success_count = 0
-        
-        for i, doc in enumerate(documents, 1):
-            title = doc.get('title', 'Untitled')[:60]
-            print(f"[{i}/{len(documents)}] {title}...")
-            
-            # Download and extract PDF content
-            pdf_url = doc.get('pdf_url')
-            pdf_content = None
-            
-            if pdf_url:
-                pdf_content = self.download_pdf(pdf_url)
-                if pdf_content:
-                    print(f"   ✅ Extracted {len(pdf_content)} characters from PDF")
-                else:
-                    print("   ⚠️  PDF extraction failed, using abstract only")
-            else:
-                print("   ⚠️  No PDF URL available")
-            
-            if self.save_document(doc, pdf_content):
-                success_count += 1
-            
-            # Rate limiting - be respectful
-            if i < len(documents):
-                time.sleep(2)  # Longer delay for PDF downloads
-            
-            print()
+        success_count = asyncio.run(self.process_documents(documents))
+        print()
         
         print("✅ Download completed!")
         print(f"📊 Successfully saved: {success_count}/{len(documents)} documents")
@@ -349,10 +1027,21 @@ def main():
     parser.add_argument("--output", default="corpus/federal-register/ai-documents", help="Output directory")
     parser.add_argument("--max-docs", type=int, default=10, help="Maximum documents per search term")
     parser.add_argument("--comprehensive", action="store_true", help="Run comprehensive search with multiple AI terms")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="Maximum concurrent PDF downloads")
+    parser.add_argument("--backend", choices=PDF_BACKENDS, default=DEFAULT_BACKEND, help="PDF text extraction backend")
+    parser.add_argument("--refresh", action="store_true", help="Revalidate cached PDFs with the server instead of reusing them")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, default=DEFAULT_OUTPUT_FORMAT, help="Write one .txt per document or a single compressed JSONL corpus")
     
     args = parser.parse_args()
     
-    client = FederalRegisterAPI(output_dir=args.output, max_docs=args.max_docs)
+    client = FederalRegisterAPI(
+        output_dir=args.output,
+        max_docs=args.max_docs,
+        concurrency=args.concurrency,
+        backend=args.backend,
+        refresh=args.refresh,
+        output_format=args.format,
+    )
     
     if args.comprehensive:
         success = client.run_comprehensive_search()